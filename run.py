@@ -7,6 +7,8 @@ import mediapipe as mp
 from pygame.locals import *
 import traceback
 import time
+import threading
+from functools import lru_cache
 
 # Add src directory to path
 sys.path.append(os.path.join(os.path.dirname(__file__), 'src'))
@@ -15,15 +17,31 @@ sys.path.append(os.path.join(os.path.dirname(__file__), 'src'))
 from head_tracking.head_tracker import HeadTracker
 from game.racing import RacingGame
 
-# Initialize pygame
+# Let SDL's 2D renderer batch draw calls (SDL reads hints from the environment at init)
+os.environ.setdefault("SDL_RENDER_BATCHING", "1")
+
+# Initialize pygame (mixer opens at the assets' rate with a small buffer)
+pygame.mixer.pre_init(44100, -16, 2, 512)
 pygame.init()
+debug_font = pygame.font.Font(None, 24)  # Created once, shared by all debug text
 
 # Constants
 WINDOW_WIDTH = 1024
 WINDOW_HEIGHT = 768
 FPS = 60
+PAUSED_FPS = 10  # Frame rate while the game is paused
 CAMERA_WIDTH = 320
 CAMERA_HEIGHT = 240
+CAMERA_FPS = 30  # Frame rate requested from the camera
+TRACKING_CONFIDENCE_THRESHOLD = 0.5  # Below this, rerun full face detection
+HEAD_POSE_TIMEOUT = 0.5  # Seconds without a published pose before steering goes neutral
+
+# Display options (vsync is off unless explicitly requested)
+VSYNC = os.environ.get("HEADRACE_VSYNC", "0") == "1"
+FULLSCREEN = os.environ.get("HEADRACE_FULLSCREEN", "0") == "1"
+
+# Optional MediaPipe Tasks face_landmarker.task model, enables GPU inference
+FACE_MODEL_PATH = os.environ.get("HEADRACE_FACE_MODEL")
 
 # Game states
 STATE_CALIBRATION = 0
@@ -31,20 +49,41 @@ STATE_GAME = 1
 STATE_PAUSED = 2
 
 # Initialize display
-screen = pygame.display.set_mode((WINDOW_WIDTH, WINDOW_HEIGHT))
+display_flags = pygame.DOUBLEBUF | pygame.HWSURFACE
+if FULLSCREEN:
+    display_flags |= pygame.FULLSCREEN
+if VSYNC:
+    try:
+        # pygame only honours vsync on SCALED/OPENGL displays
+        screen = pygame.display.set_mode((WINDOW_WIDTH, WINDOW_HEIGHT), display_flags | pygame.SCALED, vsync=1)
+    except pygame.error as e:
+        print(f"Vsync not available, falling back to vsync off: {e}")
+        VSYNC = False
+if not VSYNC:
+    screen = pygame.display.set_mode((WINDOW_WIDTH, WINDOW_HEIGHT), display_flags, vsync=0)
 pygame.display.set_caption("Head Racing Game")
+screen_size = screen.get_size()
 clock = pygame.time.Clock()
 
 # Initialize head tracker
 head_tracker = None
 try:
-    head_tracker = HeadTracker()
+    head_tracker = HeadTracker(
+        face_model_path=FACE_MODEL_PATH,
+        capture_width=CAMERA_WIDTH,
+        capture_height=CAMERA_HEIGHT,
+        capture_fps=CAMERA_FPS
+    )
+    head_tracker.warmup()
     print("Head tracker initialized successfully")
 except Exception as e:
     print(f"Error initializing head tracker: {e}")
     print(traceback.format_exc())
     sys.exit(1)
 
+# Camera feed surface in display format, reused every frame
+camera_surface = pygame.Surface((CAMERA_WIDTH, CAMERA_HEIGHT)).convert()
+
 # Initialize racing game
 racing_game = None
 try:
@@ -57,7 +96,7 @@ except Exception as e:
 
 # Load sounds
 try:
-    pygame.mixer.init()
+    pygame.mixer.set_num_channels(8)
     background_music = pygame.mixer.Sound(os.path.join(os.path.dirname(__file__), 'sounds', 'background.mp3'))
     crash_sound = pygame.mixer.Sound(os.path.join(os.path.dirname(__file__), 'sounds', 'crash.mp3'))
     # Load new sound effects
@@ -70,6 +109,12 @@ try:
     collision_sound.set_volume(0.8)
     racing_sound.set_volume(0.6)
     
+    # Reserve dedicated effect channels so play() never has to search for a free one
+    pygame.mixer.set_reserved(3)
+    racing_channel = pygame.mixer.Channel(0)
+    collision_channel = pygame.mixer.Channel(1)
+    crash_channel = pygame.mixer.Channel(2)
+    
     # Play background music
     background_music.play(-1)  # Loop indefinitely
     
@@ -82,14 +127,21 @@ except Exception as e:
     crash_sound = None
     collision_sound = None
     racing_sound = None
+    racing_channel = None
+    collision_channel = None
+    crash_channel = None
 
 # Initialize game state
 current_state = STATE_CALIBRATION
 paused = False
 show_camera = True
 show_debug = False
+head_tracker.set_debug_draw(show_camera)  # Overlays are only visible in the camera feed
 last_key_time = 0
-key_cooldown = 0.2  # seconds
+key_cooldown = 200  # milliseconds
+redraw = True  # Whether a paused frame needs repainting
+last_racing_sound_time = 0
+racing_sound_interval = 500  # milliseconds between racing sound restarts
 
 # Calibrate head tracker
 print("Starting head tracker calibration...")
@@ -102,15 +154,112 @@ else:
 # Switch to game state
 current_state = STATE_GAME
 
+# Debug panel background with the static controls text rendered once
+debug_background = pygame.Surface((400, 200)).convert()
+debug_background.fill((0, 0, 0))
+controls_text = debug_font.render("Controls: ESC=Exit, SPACE=Pause, C=Toggle Camera, D=Toggle Debug", True, (255, 255, 255))
+debug_background.blit(controls_text, (10, 100))
+more_controls_text = debug_font.render("R=Recalibrate, M=Toggle Mode", True, (255, 255, 255))
+debug_background.blit(more_controls_text, (10, 130))
+debug_panel_y = WINDOW_HEIGHT - 200
+debug_panel_rect = debug_background.get_rect(topleft=(0, debug_panel_y))
+
+@lru_cache(maxsize=256)
+def render_debug_text(text):
+    """Render a debug line, memoized because most lines repeat between frames"""
+    return debug_font.render(text, True, (255, 255, 255))
+
+# Head pose is published as signed Q7 fixed point: [-1, 1] maps to [-127, 127]
+Q7_SCALE = 127
+Q7_TO_FLOAT = 1.0 / Q7_SCALE
+
+def quantize_q7(value):
+    """Quantize a control value in [-1, 1] to an int8-range Q7 integer"""
+    return max(-Q7_SCALE, min(Q7_SCALE, int(round(value * Q7_SCALE))))
+
+# Errors already reported from the main loop and tracker thread, so repeated failures don't flood stdout
+reported_errors = set()
+
+def report_error_once(context, error):
+    """Print an error and its traceback the first time it happens in a context"""
+    if context in reported_errors:
+        return
+    reported_errors.add(context)
+    print(f"Error {context}: {error}")
+    print(traceback.format_exc())
+
+# Latest head pose published by the tracker thread: (angle_q7, tilt_q7, timestamp)
+head_pose = (0, 0, time.time())
+head_pose_lock = threading.Lock()
+recalibrate_event = threading.Event()
+
+def _tracker_worker():
+    """Run head tracking off the render loop and publish the latest pose"""
+    global head_pose
+    needs_detection = True  # Full face detection until landmark tracking takes over
+    
+    # Bind tracker methods once, this loop runs at camera rate
+    detect_head = head_tracker.update
+    track_head = head_tracker.track
+    get_head_angle = head_tracker.get_head_angle
+    get_head_tilt = head_tracker.get_head_tilt
+    
+    while running:
+        try:
+            if recalibrate_event.is_set():
+                # The game is frozen while the player recalibrates
+                print("Recalibrating head tracker...")
+                try:
+                    head_tracker.calibrate()
+                    print("Calibration complete")
+                finally:
+                    recalibrate_event.clear()
+                needs_detection = True
+            
+            # Track the previous face region while confident
+            last_frame_id = head_tracker.frame_id
+            if needs_detection:
+                tracked = detect_head()
+            else:
+                tracked = track_head()
+            needs_detection = head_tracker.last_confidence < TRACKING_CONFIDENCE_THRESHOLD
+            
+            # Only publish poses from new frames, so a stalled camera times out to neutral
+            if head_tracker.frame_id != last_frame_id:
+                angle = quantize_q7(get_head_angle())
+                tilt = quantize_q7(get_head_tilt())
+                with head_pose_lock:
+                    head_pose = (angle, tilt, time.time())
+            
+            if not tracked:
+                time.sleep(0.005)  # Avoid spinning when the camera has nothing new
+        except Exception as e:
+            # Keep the thread alive, the main loop steers neutral until poses arrive again
+            report_error_once("tracking head", e)
+            needs_detection = True
+            time.sleep(0.1)
+
+# Bind hot-loop methods once instead of looking them up every frame
+get_events = pygame.event.get
+update_game = racing_game.update
+render_game = racing_game.render
+blit = screen.blit
+blits = screen.blits
+update_display = pygame.display.update
+
 # Main game loop
 running = True
+exit_code = 0
+tracker_thread = threading.Thread(target=_tracker_worker, daemon=True)
+tracker_thread.start()
 while running:
     # Handle events
-    for event in pygame.event.get():
+    for event in get_events():
+        redraw = True  # Any event may change what a paused frame shows
         if event.type == pygame.QUIT:
             running = False
         elif event.type == pygame.KEYDOWN:
-            current_time = time.time()
+            current_time = pygame.time.get_ticks()
             if current_time - last_key_time > key_cooldown:
                 last_key_time = current_time
                 
@@ -125,14 +274,13 @@ while running:
                         print("Game resumed")
                 elif event.key == pygame.K_c:
                     show_camera = not show_camera
+                    head_tracker.set_debug_draw(show_camera)
                     print(f"Camera display: {'on' if show_camera else 'off'}")
                 elif event.key == pygame.K_d:
                     show_debug = not show_debug
                     print(f"Debug info: {'on' if show_debug else 'off'}")
                 elif event.key == pygame.K_r:
-                    print("Recalibrating head tracker...")
-                    head_tracker.calibrate()
-                    print("Calibration complete")
+                    recalibrate_event.set()
                 elif event.key == pygame.K_m:
                     # Toggle between different modes
                     if current_state == STATE_GAME:
@@ -142,98 +290,116 @@ while running:
                         current_state = STATE_GAME
                         print("Game resumed")
     
-    # Clear screen
-    screen.fill((0, 0, 0))
+    # While paused, keep the last presented frame until something changes
+    if current_state == STATE_PAUSED and not redraw:
+        clock.tick(PAUSED_FPS)
+        continue
+    redraw = False
     
-    # Update head tracker
-    head_tracker.update()
+    # Get the latest head position from the tracker thread
+    with head_pose_lock:
+        head_angle_q, head_tilt_q, pose_time = head_pose
     
-    # Get head position
-    head_angle = head_tracker.get_head_angle()
-    head_tilt = head_tracker.get_head_tilt()
+    # Steer neutral if the tracker stopped publishing instead of holding a stale pose
+    if time.time() - pose_time > HEAD_POSE_TIMEOUT:
+        head_angle_q = head_tilt_q = 0
+    head_angle = head_angle_q * Q7_TO_FLOAT
+    head_tilt = head_tilt_q * Q7_TO_FLOAT
     
-    # Update game based on current state
-    if current_state == STATE_GAME:
-        # Get previous game state for sound effects
-        previous_speed = racing_game.speed
-        previous_collision_time = racing_game.last_collision_time
-        
-        # Update game state
-        racing_game.update(head_angle, head_tilt)
-        
-        # Play sound effects based on game state changes
-        try:
-            # Play racing sound when accelerating
-            if racing_sound and racing_game.speed > previous_speed + 0.5:
-                racing_sound.play()
+    # Stop the game cleanly if updating or rendering fails
+    try:
+        # Update game based on current state, frozen while recalibrating
+        if current_state == STATE_GAME and not recalibrate_event.is_set():
+            # Get previous game state for sound effects
+            previous_speed = racing_game.speed
+            previous_collision_time = racing_game.last_collision_time
             
-            # Play collision sound when collision occurs
-            if collision_sound and racing_game.last_collision_time > previous_collision_time:
-                collision_sound.play()
+            # Update game state
+            update_game(head_angle, head_tilt)
             
-            # Play crash sound when game over
-            if crash_sound and racing_game.game_over and not racing_game.game_over_sound_played:
-                crash_sound.play()
-                racing_game.game_over_sound_played = True
-        except Exception as e:
-            print(f"Error playing sound effects: {e}")
+            # Play sound effects based on game state changes
+            try:
+                # Play racing sound when accelerating, without restarting it mid-playback
+                if racing_sound and racing_game.speed > previous_speed + 0.5:
+                    current_time = pygame.time.get_ticks()
+                    if not racing_channel.get_busy() and current_time - last_racing_sound_time > racing_sound_interval:
+                        racing_channel.play(racing_sound)
+                        last_racing_sound_time = current_time
+                
+                # Play collision sound when collision occurs
+                if collision_sound and racing_game.last_collision_time > previous_collision_time:
+                    collision_channel.play(collision_sound)
+                
+                # Play crash sound when game over
+                if crash_sound and racing_game.game_over and not racing_game.game_over_sound_played:
+                    crash_channel.play(crash_sound)
+                    racing_game.game_over_sound_played = True
+            except Exception as e:
+                report_error_once("playing sound effects", e)
+        
+        # Render game
+        game_surface = render_game()
+    except Exception as e:
+        print(f"Error in game loop: {e}")
+        print(traceback.format_exc())
+        running = False  # Also stops the tracker thread
+        exit_code = 1
+        break
     
-    # Render game
-    game_surface = racing_game.render()
-    screen.blit(game_surface, (0, 0))
+    # Regions changed this frame, presented with display.update
+    dirty_rects = []
+    
+    # Clear screen only when the game surface doesn't cover the whole window
+    if game_surface.get_size() != screen_size:
+        dirty_rects.append(screen.fill((0, 0, 0)))
+    dirty_rects.append(blit(game_surface, (0, 0)))
     
     # Render camera feed if enabled
     if show_camera:
         try:
-            camera_surface = head_tracker.get_frame_surface(CAMERA_WIDTH, CAMERA_HEIGHT)
-            screen.blit(camera_surface, (WINDOW_WIDTH - CAMERA_WIDTH, 0))
+            head_tracker.blit_frame_into(camera_surface)
+            dirty_rects.append(blit(camera_surface, (WINDOW_WIDTH - CAMERA_WIDTH, 0)))
         except Exception as e:
-            print(f"Error rendering camera feed: {e}")
-            print(traceback.format_exc())
+            report_error_once("rendering camera feed", e)
     
     # Show debug info if enabled
     if show_debug:
         try:
-            # Create debug panel
-            debug_panel = pygame.Surface((400, 200))
-            debug_panel.fill((0, 0, 0))
-            
-            # Add debug text
-            font = pygame.font.Font(None, 24)
-            
             # Head tracking info
-            head_text = font.render(f"Head Angle: {head_angle:.2f}, Tilt: {head_tilt:.2f}", True, (255, 255, 255))
-            debug_panel.blit(head_text, (10, 10))
+            head_text = render_debug_text(f"Head Angle: {head_angle:.2f}, Tilt: {head_tilt:.2f}")
             
             # Game state info
-            state_text = font.render(f"Game State: {'Running' if current_state == STATE_GAME else 'Paused'}", True, (255, 255, 255))
-            debug_panel.blit(state_text, (10, 40))
+            state_text = render_debug_text(f"Game State: {'Running' if current_state == STATE_GAME else 'Paused'}")
             
             # FPS info
-            fps_text = font.render(f"FPS: {int(clock.get_fps())}", True, (255, 255, 255))
-            debug_panel.blit(fps_text, (10, 70))
-            
-            # Controls info
-            controls_text = font.render("Controls: ESC=Exit, SPACE=Pause, C=Toggle Camera, D=Toggle Debug", True, (255, 255, 255))
-            debug_panel.blit(controls_text, (10, 100))
+            fps_text = render_debug_text(f"FPS: {int(clock.get_fps())}")
             
-            # More controls info
-            more_controls_text = font.render("R=Recalibrate, M=Toggle Mode", True, (255, 255, 255))
-            debug_panel.blit(more_controls_text, (10, 130))
-            
-            # Display debug panel
-            screen.blit(debug_panel, (0, WINDOW_HEIGHT - 200))
+            # Draw cached background (includes controls info) and text in one batched call
+            blits([
+                (debug_background, (0, debug_panel_y)),
+                (head_text, (10, debug_panel_y + 10)),
+                (state_text, (10, debug_panel_y + 40)),
+                (fps_text, (10, debug_panel_y + 70))
+            ], doreturn=False)
+            dirty_rects.append(debug_panel_rect)
         except Exception as e:
-            print(f"Error rendering debug info: {e}")
-            print(traceback.format_exc())
+            report_error_once("rendering debug info", e)
     
-    # Update display
-    pygame.display.flip()
+    # Update only the changed regions of the display
+    update_display(dirty_rects)
     
-    # Cap the frame rate
-    clock.tick(FPS)
+    # Cap the frame rate (sleeping at a lower rate while paused). tick() sleeps
+    # and releases the GIL, tick_busy_loop() would starve the tracker thread
+    if current_state == STATE_PAUSED:
+        clock.tick(PAUSED_FPS)
+    else:
+        clock.tick(FPS)
 
 # Clean up
+tracker_thread.join(timeout=1.0)
 pygame.quit()
-print("Game exited successfully")
-sys.exit(0) 
\ No newline at end of file
+if exit_code == 0:
+    print("Game exited successfully")
+else:
+    print("Game exited after an error")
+sys.exit(exit_code) 
\ No newline at end of file
@@ -1,9 +1,79 @@
+import os
 import pygame
 import random
 import math
 import numpy as np
 import time
 import traceback
+from collections import deque
+
+from numba_support import njit, warm_up
+
+# pygame-ce adds faster blit paths such as Surface.fblits
+IS_PYGAME_CE = getattr(pygame, "IS_CE", False)
+
+@njit(cache=True)
+def _find_collision(obstacles, car_left, car_top, car_width, car_height, obstacle_width, obstacle_height):
+    """
+    Find the first obstacle overlapping the car
+    
+    Uses integer rectangles, like pygame.Rect.colliderect.
+    
+    Returns:
+        int: Index of the colliding obstacle, or -1
+    """
+    for i in range(obstacles.shape[0]):
+        x = int(obstacles[i, 0])
+        y = int(obstacles[i, 1])
+        if (x < car_left + car_width and x + obstacle_width > car_left and
+                y < car_top + car_height and y + obstacle_height > car_top):
+            return i
+    return -1
+
+warm_up(_find_collision, np.zeros((1, 2), dtype=np.float32), 0, 0, 1, 1, 1, 1)
+
+@njit(cache=True, fastmath=True)
+def _step_physics(speed, car_x, road_line_offset, head_angle, head_tilt,
+                  acceleration, deceleration, friction, min_speed, max_speed,
+                  steering_sensitivity, line_period):
+    """
+    Advance speed, road line offset and car position by one frame
+    
+    Returns:
+        tuple: (speed, car_x, car_speed_x, road_line_offset, control), control is
+               1 when accelerating, -1 when braking and 0 otherwise
+    """
+    # Head tilting forward (negative value) means accelerate
+    # Head tilting backward (positive value) means brake
+    control = 0
+    if head_tilt < -0.1:  # Head away from camera
+        speed += acceleration * (-head_tilt) * 3  # Increased acceleration coefficient
+        control = 1
+    elif head_tilt > 0.1:  # Head closer to camera
+        speed -= deceleration * head_tilt * 3  # Increased deceleration coefficient
+        control = -1
+    elif speed > 0:
+        # Natural deceleration (friction)
+        speed -= friction
+    else:
+        speed += friction
+    
+    # Limit speed range, with a minimum speed to keep the game moving
+    speed = max(min_speed, min(max_speed, speed))
+    if speed < 1.0:
+        speed = 1.0
+    
+    # Update road line offset (simulate road movement)
+    if speed > 0:
+        road_line_offset += speed * 3  # Increased movement speed
+        if road_line_offset > line_period:
+            road_line_offset = 0.0
+    
+    # Update car horizontal position (based on head angle)
+    car_speed_x = head_angle * steering_sensitivity
+    return speed, car_x + car_speed_x, car_speed_x, road_line_offset, control
+
+warm_up(_step_physics, 0.0, 0.0, 0.0, 0.0, 0.0, 0.0, 0.0, 0.0, 0.0, 1.0, 0.0, 60)
 
 class RacingGame:
     def __init__(self, width, height):
@@ -19,15 +89,19 @@ class RacingGame:
         # Basic settings
         self.width = width
         self.height = height
+        self.debug = os.environ.get("RACING_DEBUG", "0") == "1"  # Print per-event game log
         self.surface = pygame.Surface((width, height))
+        if pygame.display.get_surface() is not None:
+            self.surface = self.surface.convert()  # Display format for fast blits
         
         # Road parameters
         self.road_width = 300  # Road width
         self.road_center_x = width // 2  # Road center position
+        self.y_scale = 200.0 / height  # Curve offset per unit curvature per pixel of depth
         self.road_line_width = 10  # Road center line width
         self.road_line_length = 30  # Road center line length
         self.road_line_gap = 30  # Road center line gap
-        self.road_line_offset = 0  # Road center line offset
+        self.road_line_offset = 0.0  # Road center line offset
         
         # Road curve parameters
         self.road_curvature = 0.0  # Current road curvature
@@ -35,8 +109,9 @@ class RacingGame:
         self.max_curvature = 0.3  # Maximum curvature
         self.curvature_change_speed = 0.002  # Curvature change speed
         
-        # Road segment parameters
-        self.road_segments = []
+        # Road segment parameters (parallel arrays, sorted top to bottom by y)
+        self.segment_y = np.empty(0)
+        self.segment_curve = np.empty(0)
         self.segment_height = 5  # Reduced segment height for smoother road
         self.num_segments = height // self.segment_height + 10  # Increased segments for continuity
         
@@ -51,10 +126,11 @@ class RacingGame:
         self.steering = 0
         self.max_steering = 5
         self.steering_sensitivity = 5.0
-        self.car_x = width // 2
+        self.car_x = float(width // 2)
         self.car_y = height - 100
         self.car_width = 40
         self.car_height = 70
+        self.car_rect = pygame.Rect(self.car_x, self.car_y, self.car_width, self.car_height)  # Pixel position, kept in sync with car_x
         self.car_speed_x = 0
         self.score = 100  # Initial score is 100
         self.game_over = False
@@ -66,8 +142,8 @@ class RacingGame:
         self.time_score_interval = 5.0  # Add score every 5 seconds
         self.time_score_amount = 5  # Add 5 points each time
         
-        # Obstacles
-        self.obstacles = []
+        # Obstacles, one (x, y) row per obstacle
+        self.obstacles = np.empty((0, 2), dtype=np.float32)
         self.obstacle_width = 40
         self.obstacle_height = 60
         self.obstacle_speed = 5
@@ -83,13 +159,37 @@ class RacingGame:
         
         # Mountains and clouds
         self.mountains = self.generate_mountains()
-        self.clouds = self.generate_clouds()
+        self.cloud_xy, self.cloud_radius, self.cloud_speed = self.generate_clouds()
+        self.cloud_sprites = self._build_cloud_sprites()
+        
+        # Static scenery (sky, mountains, grass) is painted once
+        self.background = self._build_background()
         
         # Initialize pygame
         pygame.font.init()
         self.font = pygame.font.Font(None, 36)
         self.small_font = pygame.font.Font(None, 24)  # Add small font
         
+        # Text caches (font rasterization is expensive, most HUD text repeats)
+        self.fonts = {36: self.font, 24: self.small_font}  # Fonts by size
+        self.text_cache = {}  # (text, size, color) -> rendered surface
+        self.text_cache_size = 256  # Clear the cache when it grows past this
+        
+        # Semi-transparent panels, filled once and reused every frame
+        self.info_panel = pygame.Surface((200, 150), pygame.SRCALPHA)
+        self.info_panel.fill((0, 0, 0, 128))
+        self.hint_panel = pygame.Surface((250, 80), pygame.SRCALPHA)
+        self.hint_panel.fill((0, 0, 0, 128))
+        self.game_over_overlay = pygame.Surface((width, height), pygame.SRCALPHA)
+        self.game_over_overlay.fill((0, 0, 0, 128))
+        
+        # Pre-render constant control hints
+        self.hint_texts = [
+            self.small_font.render("Head closer to camera = Brake", True, (255, 255, 255)),
+            self.small_font.render("Head away from camera = Accelerate", True, (255, 255, 255)),
+            self.small_font.render("Head tilt left/right = Steering", True, (255, 255, 255))
+        ]
+        
         # Load images
         try:
             self.car_img = pygame.Surface((self.car_width, self.car_height))
@@ -100,6 +200,10 @@ class RacingGame:
         except Exception as e:
             print(f"Error loading images: {e}")
         
+        # Convert sprites to display format now, or on first render if no display is set yet
+        self.images_converted = False
+        self._convert_images()
+        
         # Generate initial road segments
         self.generate_road_segments()
         
@@ -107,34 +211,39 @@ class RacingGame:
         self._spawn_initial_obstacles()
         
         # Game messages
-        self.messages = []  # Store temporary messages
+        self.messages = deque()  # Store temporary messages, oldest first
         self.message_duration = 2.0  # Message display time (seconds)
         
         print("Racing game initialization complete")
     
     def generate_road_segments(self):
         """Generate road segments"""
-        self.road_segments = []
+        n = self.num_segments
         
-        # Generate road segments from bottom to top
-        for i in range(self.num_segments):
-            y = self.height - i * self.segment_height
-            
-            # Randomly generate road curvature
-            if random.random() < 0.1:
-                self.target_curve = random.uniform(-self.max_curvature, self.max_curvature)
-            
-            # Smooth transition to target curvature
-            if self.road_curvature < self.target_curve:
-                self.road_curvature = min(self.road_curvature + self.curvature_change_speed, self.target_curve)
-            elif self.road_curvature > self.target_curve:
-                self.road_curvature = max(self.road_curvature - self.curvature_change_speed, self.target_curve)
-            
-            # Add road segment
-            self.road_segments.append({
-                'y': y,
-                'curve': self.road_curvature
-            })
+        # Segments where the road picks a new target curvature
+        change_idx = np.flatnonzero(np.random.random(n) < 0.1)
+        targets = np.concatenate((
+            [self.target_curve],
+            np.random.uniform(-self.max_curvature, self.max_curvature, len(change_idx))
+        ))
+        bounds = np.concatenate(([0], change_idx, [n]))
+        
+        # Between target changes, curvature moves towards the target at a fixed rate and stays there
+        steps = np.arange(1, n + 1) * self.curvature_change_speed
+        curves = np.empty(n)
+        for target, run_start, run_end in zip(targets.tolist(), bounds[:-1].tolist(), bounds[1:].tolist()):
+            if run_start == run_end:
+                continue
+            gap = self.road_curvature - target
+            remaining = np.maximum(abs(gap) - steps[:run_end - run_start], 0.0)
+            curves[run_start:run_end] = target + math.copysign(1.0, gap) * remaining
+            self.road_curvature = float(curves[run_end - 1])
+        self.target_curve = float(targets[-1])
+        
+        # Generated from bottom to top, stored top to bottom so new segments continue the curve from the top
+        ys = self.height - np.arange(n) * self.segment_height
+        self.segment_y = ys[::-1].astype(np.float64)
+        self.segment_curve = curves[::-1].copy()
     
     def generate_mountains(self):
         """Generate mountains"""
@@ -155,7 +264,12 @@ class RacingGame:
             return []
     
     def generate_clouds(self):
-        """Generate clouds"""
+        """
+        Generate clouds
+        
+        Returns:
+            tuple: (positions (N, 2), radii (N,), speeds (N,)) arrays
+        """
         try:
             clouds = []
             num_clouds = 5
@@ -167,18 +281,95 @@ class RacingGame:
                 speed = random.uniform(0.2, 0.5)
                 clouds.append((x, y, radius, speed))
             
-            return clouds
+            xs, ys, radii, speeds = zip(*clouds)
+            return (
+                np.column_stack((xs, ys)).astype(np.float64),
+                np.array(radii, dtype=np.int64),
+                np.array(speeds, dtype=np.float64)
+            )
         except Exception as e:
             print(f"Error generating clouds: {e}")
             print(traceback.format_exc())
-            return []
+            return np.empty((0, 2)), np.empty(0, dtype=np.int64), np.empty(0)
+    
+    def _build_cloud_sprites(self):
+        """
+        Pre-render one cloud sprite per cloud radius
+        
+        Returns:
+            dict: radius -> pygame.Surface, cloud centered in the sprite
+        """
+        sprites = {}
+        for radius in set(self.cloud_radius.tolist()):
+            side_offset = int(radius * 0.7)
+            side_radius = int(radius * 0.8)
+            half_width = side_offset + side_radius
+            sprite = pygame.Surface((half_width * 2, radius * 2), pygame.SRCALPHA)
+            
+            # Three overlapping circles: a large one in the middle, smaller ones on each side
+            pygame.draw.circle(sprite, (255, 255, 255), (half_width, radius), radius)
+            pygame.draw.circle(sprite, (255, 255, 255), (half_width + side_offset, radius), side_radius)
+            pygame.draw.circle(sprite, (255, 255, 255), (half_width - side_offset, radius), side_radius)
+            
+            if pygame.display.get_surface() is not None:
+                sprite = sprite.convert_alpha()
+            sprites[radius] = sprite
+        return sprites
+    
+    def _convert_images(self):
+        """Convert car and obstacle sprites to display format for fast blits"""
+        if pygame.display.get_surface() is None:
+            return
+        self.car_img = self.car_img.convert()
+        self.obstacle_img = self.obstacle_img.convert()
+        self.images_converted = True
+    
+    def _build_background(self):
+        """
+        Paint the static scenery once
+        
+        Clouds stay above the horizon, so drawing them over this background
+        gives the same frame as drawing them between mountains and grass.
+        
+        Returns:
+            pygame.Surface: Sky, mountains and grass
+        """
+        background = pygame.Surface((self.width, self.height))
+        if pygame.display.get_surface() is not None:
+            background = background.convert()
+        
+        # Sky
+        background.fill((135, 206, 235))  # Sky blue
+        
+        # Mountains
+        for x, height, width in self.mountains:
+            pygame.draw.polygon(
+                background,
+                (100, 100, 100),  # Gray
+                [
+                    (x, self.height // 3),
+                    (x + width // 2, self.height // 3 - height),
+                    (x + width, self.height // 3)
+                ]
+            )
+        
+        # Grass
+        pygame.draw.rect(
+            background,
+            (34, 139, 34),  # Forest green
+            (0, self.height // 3, self.width, self.height)
+        )
+        
+        return background
     
     def _spawn_initial_obstacles(self):
         """Generate initial obstacles"""
+        initial_obstacles = []
         for i in range(3):  # Generate 3 initial obstacles
             road_left, road_right = self._get_road_boundaries(i * 200)
             obstacle_x = random.uniform(road_left + 20, road_right - self.obstacle_width - 20)
-            self.obstacles.append((obstacle_x, i * 200))
+            initial_obstacles.append((obstacle_x, i * 200))
+        self.obstacles = np.vstack((self.obstacles, np.array(initial_obstacles, dtype=np.float32)))
     
     def update(self, head_angle, head_tilt):
         """
@@ -190,45 +381,38 @@ class RacingGame:
                                Positive value means closer to camera (brake)
                                Negative value means away from camera (accelerate)
         """
-        try:
-            if self.game_over:
-                return
-            
-            # Update speed (based on head tilt)
-            # Head tilting forward (negative value) means accelerate
-            # Head tilting backward (positive value) means brake
-            if head_tilt < -0.1:  # Head away from camera
-                self.speed += self.acceleration * (-head_tilt) * 3  # Increased acceleration coefficient
-                self._add_message("Accelerating...")
-            elif head_tilt > 0.1:  # Head closer to camera
-                self.speed -= self.deceleration * head_tilt * 3  # Increased deceleration coefficient
-                self._add_message("Braking...")
-            else:
-                # Natural deceleration (friction)
-                self.speed -= self.friction if self.speed > 0 else -self.friction
-            
-            # Limit speed range
-            self.speed = max(self.min_speed, min(self.max_speed, self.speed))
-            
-            # Ensure minimum speed to keep the game moving
-            if not self.game_over and self.speed < 1.0:
-                self.speed = 1.0
-            
-            # Update road line offset (simulate road movement)
-            if self.speed > 0:
-                self.road_line_offset += self.speed * 3  # Increased movement speed
-                if self.road_line_offset > self.road_line_length + self.road_line_gap:
-                    self.road_line_offset = 0
-                
-                # Update road segments
-                for segment in self.road_segments:
-                    segment['y'] += self.speed * 3  # Increased movement speed
-                
-                # Remove road segments that are off-screen
-                self.road_segments = [seg for seg in self.road_segments if seg['y'] < self.height + self.segment_height]
-                
-                # Add new road segments
-                while len(self.road_segments) < self.num_segments:
+        if self.game_over:
+            return
+        
+        # One timestamp for everything that happens this frame
+        current_time = time.time()
+        
+        # Update speed, road line offset and car position (compiled when Numba is available)
+        self.speed, self.car_x, self.car_speed_x, self.road_line_offset, control = _step_physics(
+            self.speed, self.car_x, self.road_line_offset, head_angle, head_tilt,
+            self.acceleration, self.deceleration, self.friction, self.min_speed, self.max_speed,
+            self.steering_sensitivity, self.road_line_length + self.road_line_gap
+        )
+        if control > 0:
+            self._add_message("Accelerating...", current_time)
+        elif control < 0:
+            self._add_message("Braking...", current_time)
+        
+        if self.speed > 0:
+            # Update road segments
+            self.segment_y += self.speed * 3  # Increased movement speed
+            
+            # Remove road segments that are off-screen
+            # Segments are sorted by y, so the off-screen ones form a tail to slice off
+            cutoff = int(np.searchsorted(self.segment_y, self.height + self.segment_height))
+            self.segment_y = self.segment_y[:cutoff]
+            self.segment_curve = self.segment_curve[:cutoff]
+            
+            # Add new road segments above the top one
+            missing = self.num_segments - len(self.segment_y)
+            if missing > 0:
+                new_curves = np.empty(missing)
+                for i in range(missing):
                     # Randomly generate road curvature
                     if random.random() < 0.05:
                         self.target_curve = random.uniform(-self.max_curvature, self.max_curvature)
@@ -239,93 +423,81 @@ class RacingGame:
                     elif self.road_curvature > self.target_curve:
                         self.road_curvature = max(self.road_curvature - self.curvature_change_speed, self.target_curve)
                     
-                    # Add new road segment
-                    new_y = self.road_segments[0]['y'] - self.segment_height if self.road_segments else 0
-                    self.road_segments.insert(0, {
-                        'y': new_y,
-                        'curve': self.road_curvature
-                    })
-            
-            # Update car horizontal position (based on head angle and road curvature)
-            self.car_speed_x = head_angle * self.steering_sensitivity
-            self.car_x += self.car_speed_x
-            
-            # Get road boundaries at current position
-            road_left, road_right = self._get_road_boundaries(self.car_y)
-            
-            # Check if car is off-road
-            if self.car_x < road_left or self.car_x + self.car_width > road_right:
-                # If off-road, deduct points
-                if time.time() - self.last_collision_time > self.collision_cooldown:
-                    self.score -= self.off_road_penalty
-                    self.last_collision_time = time.time()
-                    self._add_message(f"Off-road! -{self.off_road_penalty} points")
+                    new_curves[i] = self.road_curvature
+                
+                # Segments generated later sit higher up, so reverse them into top-to-bottom order
+                top_y = self.segment_y[0] if len(self.segment_y) else self.segment_height
+                new_ys = top_y - self.segment_height * np.arange(missing, 0, -1)
+                self.segment_y = np.concatenate((new_ys, self.segment_y))
+                self.segment_curve = np.concatenate((new_curves[::-1], self.segment_curve))
+        
+        # Get road boundaries at current position
+        road_left, road_right = self._get_road_boundaries(self.car_y)
+        
+        # Check if car is off-road
+        if self.car_x < road_left or self.car_x + self.car_width > road_right:
+            # If off-road, deduct points
+            if current_time - self.last_collision_time > self.collision_cooldown:
+                self.score -= self.off_road_penalty
+                self.last_collision_time = current_time
+                self._add_message(f"Off-road! -{self.off_road_penalty} points", current_time)
+                if self.debug:
                     print(f"Off-road! -{self.off_road_penalty} points, current score: {self.score}")
-            
-            # Limit car to road boundaries (but allow slight off-road for player to feel penalty)
-            self.car_x = max(road_left - 20, min(road_right - self.car_width + 20, self.car_x))
-            
-            # Update obstacles
-            self._update_obstacles()
-            
-            # Check collisions
-            if self._check_collision():
-                # Collision penalty
-                if time.time() - self.last_collision_time > self.collision_cooldown:
-                    self.score -= self.collision_penalty
-                    self.last_collision_time = time.time()
-                    self._add_message(f"Collision! -{self.collision_penalty} points")
+        
+        # Limit car to road boundaries (but allow slight off-road for player to feel penalty)
+        self.car_x = max(road_left - 20, min(road_right - self.car_width + 20, self.car_x))
+        self.car_rect.x = int(self.car_x)
+        
+        # Update obstacles
+        self._update_obstacles(current_time)
+        
+        # Check collisions
+        if self._check_collision():
+            # Collision penalty
+            if current_time - self.last_collision_time > self.collision_cooldown:
+                self.score -= self.collision_penalty
+                self.last_collision_time = current_time
+                self._add_message(f"Collision! -{self.collision_penalty} points", current_time)
+                if self.debug:
                     print(f"Collision! -{self.collision_penalty} points, current score: {self.score}")
-            
-            # Check if game is over (score is 0)
-            if self.score <= 0:
-                self.score = 0
-                self.game_over = True
-                self._add_message("Game Over: Score is 0")
+        
+        # Check if game is over (score is 0)
+        if self.score <= 0:
+            self.score = 0
+            self.game_over = True
+            self._add_message("Game Over: Score is 0", current_time)
+            if self.debug:
                 print("Game Over: Score is 0")
-            
-            # Update clouds
-            for i, (x, y, radius, speed) in enumerate(self.clouds):
-                x += speed
-                if x > self.width + radius:
-                    x = -radius
-                self.clouds[i] = (x, y, radius, speed)
-            
-            # Increase score (based on speed)
-            if self.speed > 0 and not self.game_over:
-                self.score += int(self.speed * 0.01)  # Higher speed means more points
-            
-            # Increase score based on time
-            current_time = time.time()
-            if current_time - self.last_time_score >= self.time_score_interval and not self.game_over:
-                self.score += self.time_score_amount
-                self.last_time_score = current_time
-                self._add_message(f"Survival bonus +{self.time_score_amount} points")
+        
+        # Update clouds, wrapping around once they leave the screen
+        self.cloud_xy[:, 0] += self.cloud_speed
+        wrapped = self.cloud_xy[:, 0] > self.width + self.cloud_radius
+        self.cloud_xy[wrapped, 0] = -self.cloud_radius[wrapped]
+        
+        # Increase score (based on speed)
+        if self.speed > 0 and not self.game_over:
+            self.score += int(self.speed * 0.01)  # Higher speed means more points
+        
+        # Increase score based on time
+        if current_time - self.last_time_score >= self.time_score_interval and not self.game_over:
+            self.score += self.time_score_amount
+            self.last_time_score = current_time
+            self._add_message(f"Survival bonus +{self.time_score_amount} points", current_time)
+            if self.debug:
                 print(f"Survival time bonus: +{self.time_score_amount} points, current score: {self.score}")
-            
-            # Update messages
-            self.messages = [(msg, time_added) for msg, time_added in self.messages 
-                            if current_time - time_added < self.message_duration]
         
-        except Exception as e:
-            print(f"Error updating game state: {e}")
-            print(traceback.format_exc())
+        # Update messages, expired ones are always at the front
+        while self.messages and current_time - self.messages[0][1] >= self.message_duration:
+            self.messages.popleft()
     
     def _get_road_boundaries(self, y_pos):
         """Get road boundaries at specified position"""
         # Find closest road segment
-        closest_segment = None
-        min_distance = float('inf')
-        
-        for segment in self.road_segments:
-            distance = abs(segment['y'] - y_pos)
-            if distance < min_distance:
-                min_distance = distance
-                closest_segment = segment
-        
-        if closest_segment:
+        if len(self.segment_y):
+            closest = int(np.argmin(np.abs(self.segment_y - y_pos)))
+            
             # Calculate road center position (based on curvature)
-            center_x = self.road_center_x + closest_segment['curve'] * (y_pos / self.height) * 200
+            center_x = self.road_center_x + self.segment_curve[closest] * y_pos * self.y_scale
             
             # Calculate road boundaries
             left_boundary = center_x - self.road_width // 2
@@ -336,81 +508,69 @@ class RacingGame:
         # Default return
         return self.road_center_x - self.road_width // 2, self.road_center_x + self.road_width // 2
     
-    def _update_obstacles(self):
+    def _update_obstacles(self, current_time):
         """Update obstacles"""
-        try:
-            # Move existing obstacles
-            new_obstacles = []
-            for x, y in self.obstacles:
-                y += self.speed * 3  # Increased obstacle movement speed to match road movement
-                
-                # If obstacle is still on screen, keep it
-                if y < self.height:
-                    new_obstacles.append((x, y))
-                else:
-                    # Obstacle left screen, add small score
-                    self.score += 1
-                    self._add_message("Avoided obstacle +1 point")
+        # Move existing obstacles
+        self.obstacles[:, 1] += self.speed * 3  # Increased obstacle movement speed to match road movement
+        
+        # Keep obstacles still on screen
+        on_screen = self.obstacles[:, 1] < self.height
+        avoided = len(self.obstacles) - int(np.count_nonzero(on_screen))
+        if avoided:
+            self.obstacles = self.obstacles[on_screen]
+            
+            # Obstacles left screen, add small score
+            self.score += avoided
+            for _ in range(avoided):
+                self._add_message("Avoided obstacle +1 point", current_time)
+        
+        # Generate new obstacles
+        if (current_time - self.last_obstacle_time > 1.0 and 
+            random.random() < self.obstacle_spawn_rate and 
+            self.speed > 0.5):  # Lower speed threshold for generating obstacles
             
-            self.obstacles = new_obstacles
+            # Ensure new obstacles maintain distance from existing ones
+            can_spawn = not np.any(self.obstacles[:, 1] < self.min_obstacle_distance)
             
-            # Generate new obstacles
-            current_time = time.time()
-            if (current_time - self.last_obstacle_time > 1.0 and 
-                random.random() < self.obstacle_spawn_rate and 
-                self.speed > 0.5):  # Lower speed threshold for generating obstacles
-                
-                # Ensure new obstacles maintain distance from existing ones
-                can_spawn = True
-                if self.obstacles:
-                    for _, y in self.obstacles:
-                        if y < self.min_obstacle_distance:
-                            can_spawn = False
-                            break
+            if can_spawn:
+                # Get road boundaries
+                road_left, road_right = self._get_road_boundaries(0)
                 
-                if can_spawn:
-                    # Get road boundaries
-                    road_left, road_right = self._get_road_boundaries(0)
-                    
-                    # Randomly generate obstacle within road
-                    obstacle_x = random.uniform(road_left + 20, road_right - self.obstacle_width - 20)
-                    self.obstacles.append((obstacle_x, 0))
-                    self.last_obstacle_time = current_time
+                # Randomly generate obstacle within road
+                obstacle_x = random.uniform(road_left + 20, road_right - self.obstacle_width - 20)
+                self.obstacles = np.vstack((self.obstacles, np.array([[obstacle_x, 0]], dtype=np.float32)))
+                self.last_obstacle_time = current_time
+                if self.debug:
                     print(f"Generated obstacle: x={obstacle_x}, y=0")
-        
-        except Exception as e:
-            print(f"Error updating obstacles: {e}")
-            print(traceback.format_exc())
     
     def _check_collision(self):
         """Check collisions"""
-        try:
-            # Get car collision rectangle
-            car_rect = pygame.Rect(int(self.car_x), int(self.car_y), self.car_width, self.car_height)
-            
-            # Check collision with obstacles
-            for i, (x, y) in enumerate(self.obstacles[:]):
-                obstacle_rect = pygame.Rect(int(x), int(y), self.obstacle_width, self.obstacle_height)
-                if car_rect.colliderect(obstacle_rect):
-                    print(f"Collision with obstacle: car position=({self.car_x}, {self.car_y}), obstacle position=({x}, {y})")
-                    # Remove collided obstacle
-                    self.obstacles.pop(i)
-                    return True
-            
-            # Check if severely off-road
-            road_left, road_right = self._get_road_boundaries(self.car_y)
-            
-            if self.car_x + self.car_width < road_left - 50 or self.car_x > road_right + 50:
+        # Check collision with obstacles
+        i = _find_collision(
+            self.obstacles,
+            self.car_rect.x, self.car_rect.y, self.car_width, self.car_height,
+            self.obstacle_width, self.obstacle_height
+        )
+        if i >= 0:
+            if self.debug:
+                x, y = self.obstacles[i]
+                print(f"Collision with obstacle: car position=({self.car_x}, {self.car_y}), obstacle position=({x}, {y})")
+            # Remove collided obstacle, draw order doesn't matter so the last one takes its slot
+            last = len(self.obstacles) - 1
+            self.obstacles[i] = self.obstacles[last]
+            self.obstacles = self.obstacles[:last]
+            return True
+        
+        # Check if severely off-road
+        road_left, road_right = self._get_road_boundaries(self.car_y)
+        
+        if self.car_x + self.car_width < road_left - 50 or self.car_x > road_right + 50:
+            if self.debug:
                 print(f"Severely off-road: car position=({self.car_x}, {self.car_y}), road boundaries=({road_left}, {road_right})")
-                self.score -= self.off_road_penalty * 2  # Severely off-road, double penalty
-                return True
-            
-            return False
+            self.score -= self.off_road_penalty * 2  # Severely off-road, double penalty
+            return True
         
-        except Exception as e:
-            print(f"Error checking collisions: {e}")
-            print(traceback.format_exc())
-            return False
+        return False
     
     def render(self):
         """
@@ -419,185 +579,130 @@ class RacingGame:
         Returns:
             pygame.Surface: Rendered game surface
         """
-        try:
-            # Clear screen
-            self.surface.fill((135, 206, 235))  # Sky blue
-            
-            # Draw mountains
-            for x, height, width in self.mountains:
-                pygame.draw.polygon(
-                    self.surface,
-                    (100, 100, 100),  # Gray
-                    [
-                        (x, self.height // 3),
-                        (x + width // 2, self.height // 3 - height),
-                        (x + width, self.height // 3)
-                    ]
-                )
-            
-            # Draw clouds
-            for x, y, radius, _ in self.clouds:
-                pygame.draw.circle(self.surface, (255, 255, 255), (int(x), int(y)), radius)
-                pygame.draw.circle(self.surface, (255, 255, 255), (int(x + radius * 0.7), int(y)), int(radius * 0.8))
-                pygame.draw.circle(self.surface, (255, 255, 255), (int(x - radius * 0.7), int(y)), int(radius * 0.8))
-            
-            # Draw grass
-            pygame.draw.rect(
-                self.surface,
-                (34, 139, 34),  # Forest green
-                (0, self.height // 3, self.width, self.height)
-            )
-            
-            # Draw curved road
-            self._draw_curved_road()
-            
-            # Draw obstacles
-            for x, y in self.obstacles:
-                self.surface.blit(self.obstacle_img, (int(x), int(y)))
-            
-            # Draw player car
-            self.surface.blit(self.car_img, (int(self.car_x), int(self.car_y)))
-            
-            # Create semi-transparent info panel
-            info_panel = pygame.Surface((200, 150), pygame.SRCALPHA)
-            info_panel.fill((0, 0, 0, 128))  # Semi-transparent black
-            self.surface.blit(info_panel, (10, 10))
-            
-            # Draw score
-            score_text = self.font.render(f"Score: {self.score}", True, (255, 255, 255))
-            self.surface.blit(score_text, (20, 20))
-            
-            # Draw speed
-            speed_text = self.font.render(f"Speed: {int(self.speed * 10)} km/h", True, (255, 255, 255))
-            self.surface.blit(speed_text, (20, 60))
-            
-            # Draw road curvature
-            curve_text = self.small_font.render(f"Road Curvature: {self.road_curvature:.2f}", True, (255, 255, 255))
-            self.surface.blit(curve_text, (20, 100))
-            
-            # Draw game time
-            game_time = int(time.time() - self.start_time)
-            time_text = self.small_font.render(f"Game Time: {game_time}s", True, (255, 255, 255))
-            self.surface.blit(time_text, (20, 130))
-            
-            # Draw temporary messages
-            self._draw_messages()
-            
-            # Draw control hints
-            self._draw_control_hints()
-            
-            # If game over, show game over text
-            if self.game_over:
-                self._draw_game_over()
-            
-            return self.surface
+        if not self.images_converted:
+            self._convert_images()
         
-        except Exception as e:
-            print(f"Error rendering game: {e}")
-            print(traceback.format_exc())
-            
-            # Create an error screen
-            error_surface = pygame.Surface((self.width, self.height))
-            error_surface.fill((0, 0, 0))  # Black background
-            
-            # Show error message
-            error_text = self.font.render(f"Rendering Error: {str(e)}", True, (255, 0, 0))
-            error_surface.blit(error_text, (20, 20))
-            
-            return error_surface
+        # Draw static background (sky, mountains and grass)
+        self.surface.blit(self.background, (0, 0))
+        
+        # Draw clouds from their pre-rendered sprites
+        for (x, y), radius in zip(self.cloud_xy.tolist(), self.cloud_radius.tolist()):
+            sprite = self.cloud_sprites[radius]
+            self.surface.blit(sprite, (int(x) - sprite.get_width() // 2, int(y) - radius))
+        
+        # Draw curved road
+        self._draw_curved_road()
+        
+        # Draw obstacles in one batched call
+        obstacle_blits = [(self.obstacle_img, (int(x), int(y))) for x, y in self.obstacles.tolist()]
+        if IS_PYGAME_CE:
+            self.surface.fblits(obstacle_blits)
+        else:
+            self.surface.blits(obstacle_blits, doreturn=False)
+        
+        # Draw player car
+        self.surface.blit(self.car_img, self.car_rect)
+        
+        # Draw semi-transparent info panel
+        self.surface.blit(self.info_panel, (10, 10))
+        
+        # Draw score
+        score_text = self._render_text(f"Score: {self.score}", 36)
+        self.surface.blit(score_text, (20, 20))
+        
+        # Draw speed
+        speed_text = self._render_text(f"Speed: {int(self.speed * 10)} km/h", 36)
+        self.surface.blit(speed_text, (20, 60))
+        
+        # Draw road curvature
+        curve_text = self._render_text(f"Road Curvature: {self.road_curvature:.2f}", 24)
+        self.surface.blit(curve_text, (20, 100))
+        
+        # Draw game time
+        game_time = int(time.time() - self.start_time)
+        time_text = self._render_text(f"Game Time: {game_time}s", 24)
+        self.surface.blit(time_text, (20, 130))
+        
+        # Draw temporary messages
+        self._draw_messages()
+        
+        # Draw control hints
+        self._draw_control_hints()
+        
+        # If game over, show game over text
+        if self.game_over:
+            self._draw_game_over()
+        
+        return self.surface
     
     def _draw_messages(self):
         """Draw temporary messages"""
         # Show messages in top-right corner
         y_offset = 20
         for message, _ in self.messages:
-            msg_surface = self.small_font.render(message, True, (255, 255, 0))
+            msg_surface = self._render_text(message, 24, (255, 255, 0))
             self.surface.blit(msg_surface, (self.width - msg_surface.get_width() - 20, y_offset))
             y_offset += 30
     
     def _draw_curved_road(self):
         """Draw curved road"""
-        try:
-            # Ensure road segments are sorted by y-coordinate
-            sorted_segments = sorted(self.road_segments, key=lambda seg: seg['y'])
-            
-            # Draw each road segment
-            for i, segment in enumerate(sorted_segments):
-                y = segment['y']
-                curve = segment['curve']
-                
-                # Calculate road center position
-                center_x = self.road_center_x + curve * (y / self.height) * 200
-                
-                # Calculate road boundaries
-                left_boundary = center_x - self.road_width // 2
-                right_boundary = center_x + self.road_width // 2
-                
-                # Draw road segment
-                pygame.draw.rect(
-                    self.surface,
-                    (128, 128, 128),  # Gray
-                    (left_boundary, y, self.road_width, self.segment_height)
-                )
-                
-                # Draw road edge lines
-                pygame.draw.line(
-                    self.surface,
-                    (255, 255, 255),  # White
-                    (left_boundary, y),
-                    (left_boundary, y + self.segment_height),
-                    2
-                )
-                pygame.draw.line(
-                    self.surface,
-                    (255, 255, 255),  # White
-                    (right_boundary, y),
-                    (right_boundary, y + self.segment_height),
-                    2
-                )
-                
-                # Draw center line
-                if (y + int(self.road_line_offset)) % (self.road_line_length + self.road_line_gap) < self.road_line_length:
-                    pygame.draw.rect(
-                        self.surface,
-                        (255, 255, 0),  # Yellow
-                        (center_x - self.road_line_width // 2, y, self.road_line_width, 10)
-                    )
-        except Exception as e:
-            print(f"Error drawing curved road: {e}")
-            print(traceback.format_exc())
+        # Segment arrays are kept sorted top-to-bottom by generation and update
+        ys = self.segment_y
+        curves = self.segment_curve
+        if not len(ys):
+            return
+        
+        # Calculate road center and boundaries for all segments
+        centers = self.road_center_x + curves * ys * self.y_scale
+        lefts = centers - self.road_width // 2
+        rights = centers + self.road_width // 2
+        
+        # Road edges run from the top of the first segment to the bottom of the last
+        edge_ys = np.append(ys, ys[-1] + self.segment_height)
+        left_edge = np.column_stack((np.append(lefts, lefts[-1]), edge_ys)).tolist()
+        right_edge = np.column_stack((np.append(rights, rights[-1]), edge_ys)).tolist()
+        
+        # Draw the whole road surface as one polygon
+        pygame.draw.polygon(self.surface, (128, 128, 128), left_edge + right_edge[::-1])  # Gray
+        
+        # Draw road edge lines
+        pygame.draw.lines(self.surface, (255, 255, 255), False, left_edge, 2)  # White
+        pygame.draw.lines(self.surface, (255, 255, 255), False, right_edge, 2)
+        
+        # Draw center line
+        line_offset = int(self.road_line_offset)
+        line_period = self.road_line_length + self.road_line_gap
+        dash_mask = (ys + line_offset) % line_period < self.road_line_length
+        dash_xs = (centers[dash_mask] - self.road_line_width // 2).tolist()
+        dash_ys = ys[dash_mask].tolist()
+        for x, y in zip(dash_xs, dash_ys):
+            self.surface.fill((255, 255, 0), (x, y, self.road_line_width, 10))  # Yellow
     
     def _draw_game_over(self):
         """Draw game over screen"""
-        try:
-            # Create semi-transparent overlay
-            overlay = pygame.Surface((self.width, self.height), pygame.SRCALPHA)
-            overlay.fill((0, 0, 0, 128))  # Semi-transparent black
-            self.surface.blit(overlay, (0, 0))
-            
-            # Draw game over text
-            game_over_text = self.font.render("Game Over", True, (255, 0, 0))
-            text_rect = game_over_text.get_rect(center=(self.width // 2, self.height // 2 - 50))
-            self.surface.blit(game_over_text, text_rect)
-            
-            # Draw final score
-            score_text = self.font.render(f"Final Score: {self.score}", True, (255, 255, 255))
-            score_rect = score_text.get_rect(center=(self.width // 2, self.height // 2))
-            self.surface.blit(score_text, score_rect)
-            
-            # Draw game time
-            game_time = int(time.time() - self.start_time)
-            time_text = self.font.render(f"Game Time: {game_time}s", True, (255, 255, 255))
-            time_rect = time_text.get_rect(center=(self.width // 2, self.height // 2 + 40))
-            self.surface.blit(time_text, time_rect)
-            
-            # Draw restart hint
-            restart_text = self.font.render("Press ESC to exit", True, (255, 255, 255))
-            restart_rect = restart_text.get_rect(center=(self.width // 2, self.height // 2 + 80))
-            self.surface.blit(restart_text, restart_rect)
+        # Draw semi-transparent overlay
+        self.surface.blit(self.game_over_overlay, (0, 0))
         
-        except Exception as e:
-            print(f"Error drawing game over screen: {e}")
+        # Draw game over text
+        game_over_text = self._render_text("Game Over", 36, (255, 0, 0))
+        text_rect = game_over_text.get_rect(center=(self.width // 2, self.height // 2 - 50))
+        self.surface.blit(game_over_text, text_rect)
+        
+        # Draw final score
+        score_text = self._render_text(f"Final Score: {self.score}", 36)
+        score_rect = score_text.get_rect(center=(self.width // 2, self.height // 2))
+        self.surface.blit(score_text, score_rect)
+        
+        # Draw game time
+        game_time = int(time.time() - self.start_time)
+        time_text = self._render_text(f"Game Time: {game_time}s", 36)
+        time_rect = time_text.get_rect(center=(self.width // 2, self.height // 2 + 40))
+        self.surface.blit(time_text, time_rect)
+        
+        # Draw restart hint
+        restart_text = self._render_text("Press ESC to exit", 36)
+        restart_rect = restart_text.get_rect(center=(self.width // 2, self.height // 2 + 80))
+        self.surface.blit(restart_text, restart_rect)
     
     def draw_text(self, text, size, x, y, color=(255, 255, 255)):
         """
@@ -611,8 +716,7 @@ class RacingGame:
             color (tuple, optional): Text color. Defaults to (255, 255, 255).
         """
         try:
-            font = pygame.font.Font(None, size)
-            text_surface = font.render(text, True, color)
+            text_surface = self._render_text(text, size, color)
             text_rect = text_surface.get_rect()
             text_rect.topleft = (x, y)
             self.surface.blit(text_surface, text_rect)
@@ -620,23 +724,46 @@ class RacingGame:
             print(f"Error drawing text: {e}")
             print(traceback.format_exc())
     
-    def _add_message(self, message):
-        """Add temporary message"""
-        self.messages.append((message, time.time())) 
+    def _get_font(self, size):
+        """Get font of given size, creating it on first use"""
+        font = self.fonts.get(size)
+        if font is None:
+            font = pygame.font.Font(None, size)
+            self.fonts[size] = font
+        return font
+    
+    def _render_text(self, text, size, color=(255, 255, 255)):
+        """
+        Render text, reusing the surface if the same text was rendered before
+        
+        Args:
+            text (str): Text to render
+            size (int): Font size
+            color (tuple, optional): Text color. Defaults to (255, 255, 255).
+        
+        Returns:
+            pygame.Surface: Rendered text
+        """
+        key = (text, size, color)
+        text_surface = self.text_cache.get(key)
+        if text_surface is None:
+            if len(self.text_cache) >= self.text_cache_size:
+                self.text_cache.clear()
+            text_surface = self._get_font(size).render(text, True, color)
+            self.text_cache[key] = text_surface
+        return text_surface
+    
+    def _add_message(self, message, current_time=None):
+        """Add temporary message, timestamped with current_time if given"""
+        if current_time is None:
+            current_time = time.time()
+        self.messages.append((message, current_time))
 
     def _draw_control_hints(self):
         """Draw control hints"""
-        # Create semi-transparent control hint panel
-        hint_panel = pygame.Surface((250, 80), pygame.SRCALPHA)
-        hint_panel.fill((0, 0, 0, 128))  # Semi-transparent black
-        self.surface.blit(hint_panel, (self.width - 260, self.height - 90))
-        
-        # Draw control hints
-        tilt_text = self.small_font.render("Head closer to camera = Brake", True, (255, 255, 255))
-        self.surface.blit(tilt_text, (self.width - 250, self.height - 80))
-        
-        tilt_text2 = self.small_font.render("Head away from camera = Accelerate", True, (255, 255, 255))
-        self.surface.blit(tilt_text2, (self.width - 250, self.height - 60))
+        # Draw semi-transparent control hint panel
+        self.surface.blit(self.hint_panel, (self.width - 260, self.height - 90))
         
-        angle_text = self.small_font.render("Head tilt left/right = Steering", True, (255, 255, 255))
-        self.surface.blit(angle_text, (self.width - 250, self.height - 40)) 
\ No newline at end of file
+        # Draw pre-rendered control hints
+        for i, hint_text in enumerate(self.hint_texts):
+            self.surface.blit(hint_text, (self.width - 250, self.height - 80 + i * 20))
\ No newline at end of file
@@ -4,31 +4,234 @@ import mediapipe as mp
 import pygame
 import time
 import math
+import sys
+import threading
+from types import SimpleNamespace
+
+from numba_support import njit, warm_up
+
+# Native capture backend per platform, so OpenCV doesn't probe backends on open
+if sys.platform.startswith("win"):
+    CAMERA_BACKEND = cv2.CAP_DSHOW
+elif sys.platform.startswith("linux"):
+    CAMERA_BACKEND = cv2.CAP_V4L2
+elif sys.platform == "darwin":
+    CAMERA_BACKEND = cv2.CAP_AVFOUNDATION
+else:
+    CAMERA_BACKEND = cv2.CAP_ANY
+
+# Use the SIMD code paths compiled into OpenCV. The per-frame images are small
+# and tracking already runs beside the game loop, so OpenCV's own worker
+# threads would only compete with pygame for cores
+cv2.setUseOptimized(True)
+cv2.setNumThreads(1)
+
+# Face mesh outline landmarks, in drawing order for cv2.polylines
+_LEFT_EYE = np.array([33, 160, 158, 133, 153, 144], dtype=np.int32)
+_RIGHT_EYE = np.array([263, 387, 385, 362, 382, 381], dtype=np.int32)
+_MOUTH_OUTLINE = np.array([61, 146, 91, 181, 84, 17, 314, 405, 321, 375, 291], dtype=np.int32)
+
+@njit(cache=True)
+def _head_pose(landmarks):
+    """
+    Calculate head pose from an (N, 3) landmark array
+    
+    Returns:
+        tuple: (sine of the eye line angle, nose tip z)
+    """
+    # Head left/right angle (based on eye horizontal line, landmarks 33 and 263).
+    # The sine is monotonic over the head's range and matches the angle in
+    # radians for small turns, without the atan2 call
+    dx_eyes = float(landmarks[263, 0]) - float(landmarks[33, 0])
+    dy_eyes = float(landmarks[263, 1]) - float(landmarks[33, 1])
+    eye_distance = math.hypot(dx_eyes, dy_eyes)
+    angle = dy_eyes / eye_distance if eye_distance > 0.0 else 0.0
+    
+    # Head forward/backward tilt (nose tip z-coordinate, landmark 4)
+    tilt = float(landmarks[4, 2])
+    
+    return angle, tilt
+
+warm_up(_head_pose, np.zeros((264, 3), dtype=np.float32))
+
+class _CaptureThread(threading.Thread):
+    """
+    Continuously grab camera frames, decoding only the ones a reader asks for
+    
+    Frames grabbed while nobody is waiting are dropped without being decoded.
+    """
+    
+    def __init__(self, cap):
+        super().__init__(daemon=True)
+        self.cap = cap
+        self._stop_event = threading.Event()
+        self._frame = None
+        self._frame_id = 0
+        self._frame_wanted = False  # A reader is waiting for a new frame
+        self._condition = threading.Condition()
+    
+    def run(self):
+        while not self._stop_event.is_set():
+            # Grabbing keeps the stream current without decoding the frame
+            if not self.cap.grab():
+                self._stop_event.wait(0.01)
+                continue
+            
+            with self._condition:
+                frame_wanted = self._frame_wanted
+            if not frame_wanted:
+                continue
+            
+            ret, frame = self.cap.retrieve()
+            if not ret or frame is None:
+                continue
+            
+            with self._condition:
+                self._frame = frame
+                self._frame_id += 1
+                self._frame_wanted = False
+                self._condition.notify_all()
+    
+    def read(self, last_id, timeout):
+        """
+        Get the latest frame if it is newer than last_id
+        
+        Args:
+            last_id (int): Id of the last frame the caller consumed
+            timeout (float): Seconds to wait for a new frame
+        
+        Returns:
+            tuple: (frame_id, frame), frame is None on timeout
+        """
+        with self._condition:
+            if self._frame_id == last_id:
+                self._frame_wanted = True
+            if not self._condition.wait_for(
+                lambda: self._frame_id != last_id or self._stop_event.is_set(), timeout
+            ) or self._frame_id == last_id:
+                return last_id, None
+            return self._frame_id, self._frame
+    
+    def stop(self):
+        """Stop reading, wake any waiting reader and wait for the thread to exit"""
+        self._stop_event.set()
+        with self._condition:
+            self._condition.notify_all()
+        self.join(timeout=1.0)
+
+class _TaskFaceMesh:
+    """
+    FaceMesh-compatible wrapper around the MediaPipe Tasks face landmarker
+    
+    Runs the landmark model on the GPU delegate, falling back to the CPU
+    when the delegate cannot be created.
+    """
+    
+    def __init__(self, model_path, min_detection_confidence=0.5, min_tracking_confidence=0.5):
+        from mediapipe.tasks.python import BaseOptions, vision
+        
+        self.landmarker = None
+        for delegate in (BaseOptions.Delegate.GPU, BaseOptions.Delegate.CPU):
+            options = vision.FaceLandmarkerOptions(
+                base_options=BaseOptions(model_asset_path=model_path, delegate=delegate),
+                running_mode=vision.RunningMode.VIDEO,
+                num_faces=1,
+                min_face_detection_confidence=min_detection_confidence,
+                min_tracking_confidence=min_tracking_confidence
+            )
+            try:
+                self.landmarker = vision.FaceLandmarker.create_from_options(options)
+                print(f"Face landmarker using {delegate.name} delegate")
+                break
+            except Exception as e:
+                print(f"Face landmarker {delegate.name} delegate not available: {e}")
+        
+        if self.landmarker is None:
+            raise RuntimeError(f"Cannot load face landmarker model: {model_path}")
+        
+        self.last_timestamp = 0
+    
+    def process(self, rgb_frame):
+        """Detect landmarks, returning results shaped like FaceMesh.process()"""
+        # Video mode requires strictly increasing timestamps
+        timestamp = max(int(time.monotonic() * 1000), self.last_timestamp + 1)
+        self.last_timestamp = timestamp
+        
+        image = mp.Image(image_format=mp.ImageFormat.SRGB, data=np.ascontiguousarray(rgb_frame))
+        result = self.landmarker.detect_for_video(image, timestamp)
+        
+        faces = [SimpleNamespace(landmark=landmarks) for landmarks in result.face_landmarks]
+        return SimpleNamespace(multi_face_landmarks=faces or None)
+    
+    def close(self):
+        self.landmarker.close()
 
 class HeadTracker:
-    def __init__(self):
-        """Initialize head tracker"""
-        # Initialize MediaPipe face detection
-        self.mp_face_mesh = mp.solutions.face_mesh
-        self.face_mesh = self.mp_face_mesh.FaceMesh(
-            max_num_faces=1,
-            refine_landmarks=True,
-            min_detection_confidence=0.5,
-            min_tracking_confidence=0.5
-        )
+    def __init__(self, face_model_path=None, debug_draw=False, capture_width=320, capture_height=240, capture_fps=30):
+        """
+        Initialize head tracker
+        
+        Args:
+            face_model_path (str, optional): MediaPipe Tasks face_landmarker.task model.
+                When given, inference runs on the GPU delegate if available;
+                otherwise the built-in FaceMesh solution is used on the CPU.
+            debug_draw (bool): Draw the face mesh and control overlays on the frame
+            capture_width (int): Camera frame width to request, usually the display size
+            capture_height (int): Camera frame height to request
+            capture_fps (int): Camera frame rate to request
+        """
+        self.debug_draw = debug_draw
+        
+        if face_model_path:
+            self.face_mesh = _TaskFaceMesh(
+                face_model_path,
+                min_detection_confidence=0.5,
+                min_tracking_confidence=0.5
+            )
+        else:
+            # Initialize MediaPipe face detection
+            self.mp_face_mesh = mp.solutions.face_mesh
+            self.face_mesh = self.mp_face_mesh.FaceMesh(
+                static_image_mode=False,  # Track landmarks between detections
+                max_num_faces=1,
+                refine_landmarks=False,  # Iris/lip refinement isn't used by the pose
+                min_detection_confidence=0.5,
+                min_tracking_confidence=0.5
+            )
         
         # Initialize camera
-        self.cap = cv2.VideoCapture(0)
+        self.cap = self._open_camera(0)
         
         # Try other cameras if the first one fails
         if not self.cap.isOpened():
-            self.cap = cv2.VideoCapture(1)
+            self.cap = self._open_camera(1)
         
         # Use simulated data if camera still fails
         if not self.cap.isOpened():
             print("Warning: Camera not available, using simulated data")
             self.cap = None
         
+        # Capture settings
+        self.capture_width = capture_width
+        self.capture_height = capture_height
+        self.capture_fps = capture_fps
+        
+        # Read frames on a background thread so callers never block on camera IO
+        self.capture_thread = None
+        self.frame_id = 0
+        self.frame_timeout = 1.0  # Seconds to wait for a new camera frame
+        if self.cap is not None:
+            # MJPEG keeps USB bandwidth low; set before the size so drivers apply it
+            self._set_capture_property(cv2.CAP_PROP_FOURCC, cv2.VideoWriter_fourcc(*"MJPG"))
+            
+            # Capture at the size the game displays, MediaPipe resizes internally anyway
+            self.cap.set(cv2.CAP_PROP_FRAME_WIDTH, self.capture_width)
+            self.cap.set(cv2.CAP_PROP_FRAME_HEIGHT, self.capture_height)
+            self.cap.set(cv2.CAP_PROP_FPS, self.capture_fps)
+            self._set_capture_property(cv2.CAP_PROP_BUFFERSIZE, 1)  # Keep only the freshest frame in the driver
+            self.capture_thread = _CaptureThread(self.cap)
+            self.capture_thread.start()
+        
         # Calibration parameters
         self.calibration_samples = []
         self.calibration_count = 30  # Collect 30 samples for calibration
@@ -49,20 +252,36 @@ class HeadTracker:
         self.last_detection_time = time.time()
         self.detection_timeout = 1.0  # 1 second without detection is considered face loss
         
-        # Current frame and face detection results
+        # Current frame and face detection results. Processing and overlays use
+        # _work_frame, which is published as frame once the overlays are drawn
         self.frame = None
+        self._work_frame = None
+        self.frame_width = 0
+        self.frame_height = 0
+        self.frame_center = (0, 0)  # (x, y) pixel center used by the overlays
         self.results = None
+        self.landmarks = None  # (N, 3) normalized landmarks of the detected face
         self.face_detected = False
         
-        # Store recent head angles and tilts for smoothing
-        self.recent_angles = [0.0] * 5
-        self.recent_tilts = [0.0] * 5
+        # Landmark tracking state
+        self.roi = None  # (x0, y0, x1, y1) pixel region around the previous face
+        self.roi_margin = 0.25  # Expand the face bounding box by 25% on each side
+        self.min_roi_size = 32  # Smallest region (pixels) worth tracking
+        self.last_confidence = 0.0  # Fraction of landmarks inside the processed image
+        
+        # Tracked frames run inference only every inference_interval frames,
+        # the frames in between move the landmarks along their measured velocity
+        self.inference_interval = 2
+        self.frames_since_inference = 0
+        self.landmark_velocity = None  # (N, 3) landmark change per frame
+        self._measured_landmarks = None
         
         # Current frame and processed frame
         self.current_frame = None
         self.processed_frame = None
         
-        # Current head angle and tilt
+        # Current head angle and tilt (raw_pose is unscaled, from the latest frame)
+        self.raw_pose = (None, None)
         self.current_angle = 0.0
         self.current_tilt = 0.0
         
@@ -74,12 +293,48 @@ class HeadTracker:
         self.surface = None
         self.frame_surface = None
         
+        # Preallocated frame buffers for capture and inference
+        self._flip_buffers = [None, None]
+        self._flip_index = 0
+        self._small_frame = None
+        self._rgb_storage = np.empty(0, dtype=np.uint8)
+        
+        # Preallocated display buffers for blit_frame_into
+        self._display_bgr = None
+        self._display_rgb = None
+        
         # Last time face was detected
         self.last_face_time = time.time()
         self.face_timeout = 0.5  # Face timeout in seconds
         
         print("Head tracker initialized")
     
+    def _open_camera(self, index):
+        """Open a camera with the native backend, falling back to OpenCV's choice"""
+        cap = cv2.VideoCapture(index, CAMERA_BACKEND)
+        if not cap.isOpened() and CAMERA_BACKEND != cv2.CAP_ANY:
+            cap = cv2.VideoCapture(index)
+        return cap
+    
+    def _set_capture_property(self, prop, value):
+        """Set an optional capture property, which some backends don't support"""
+        try:
+            if not self.cap.set(prop, value):
+                print(f"Camera backend ignored capture property {prop}")
+        except cv2.error as e:
+            print(f"Cannot set capture property {prop}: {e}")
+    
+    def warmup(self, iterations=3):
+        """
+        Run dummy inferences so graph setup isn't paid on the first real frame
+        
+        Args:
+            iterations (int): Number of dummy inferences
+        """
+        blank_frame = np.zeros((self.capture_height, self.capture_width, 3), dtype=np.uint8)
+        for _ in range(iterations):
+            self.face_mesh.process(blank_frame)
+    
     def calibrate(self):
         """Calibrate head position"""
         print("Starting head position calibration...")
@@ -88,6 +343,14 @@ class HeadTracker:
         self.calibration_samples = []
         self.is_calibrated = False
         
+        # Without a camera update() returns at once, so don't spin until the timeout
+        if self.capture_thread is None:
+            print("Calibration failed, no camera available, using default values")
+            self.neutral_angle = 0.0
+            self.neutral_tilt = 0.0
+            self.is_calibrated = True
+            return False
+        
         # Collect calibration samples
         calibration_start = time.time()
         while len(self.calibration_samples) < self.calibration_count:
@@ -104,18 +367,17 @@ class HeadTracker:
                 continue
             
             # Get current head angle and tilt
-            angle, tilt = self._calculate_head_pose()
+            angle, tilt = self.raw_pose
             
             if angle is not None and tilt is not None:
                 self.calibration_samples.append((angle, tilt))
                 print(f"Collecting calibration sample: {len(self.calibration_samples)}/{self.calibration_count}")
-                time.sleep(0.1)  # Short delay
         
         # Calculate neutral position
         if self.calibration_samples:
-            angles, tilts = zip(*self.calibration_samples)
-            self.neutral_angle = sum(angles) / len(angles)
-            self.neutral_tilt = sum(tilts) / len(tilts)
+            neutral_angle, neutral_tilt = np.asarray(self.calibration_samples).mean(axis=0)
+            self.neutral_angle = float(neutral_angle)
+            self.neutral_tilt = float(neutral_tilt)
             self.is_calibrated = True
             print(f"Calibration complete: neutral angle={self.neutral_angle:.2f}, neutral tilt={self.neutral_tilt:.2f}")
             return True
@@ -127,195 +389,303 @@ class HeadTracker:
             return False
     
     def update(self, calibration_mode=False):
-        """Update head tracking"""
-        # Read camera frame
-        ret, self.frame = self.cap.read()
-        if not ret or self.frame is None:
-            print("Cannot read from camera")
+        """Update head tracking using full-frame face detection"""
+        if not self._read_frame():
             return False
         
-        # Flip image horizontally (mirror effect)
-        self.frame = cv2.flip(self.frame, 1)
-        
-        # Convert to RGB
-        rgb_frame = cv2.cvtColor(self.frame, cv2.COLOR_BGR2RGB)
+        # Convert to RGB at inference size, landmarks are normalized so they still match the frame
+        small_frame = self._inference_frame()
+        rgb_frame = cv2.cvtColor(small_frame, cv2.COLOR_BGR2RGB, dst=self._rgb_buffer(small_frame.shape))
         
         # Process image
         self.results = self.face_mesh.process(rgb_frame)
         
+        if self.results.multi_face_landmarks:
+            self.landmarks = self._landmark_array(self.results.multi_face_landmarks[0])
+            self.last_confidence = self._landmark_confidence(self.landmarks)
+        
+        # Full detection restarts the motion estimate
+        self.frames_since_inference = 0
+        self.landmark_velocity = None
+        self._measured_landmarks = self.landmarks
+        
+        return self._publish_results(calibration_mode)
+    
+    def track(self, calibration_mode=False):
+        """
+        Update head tracking inside the region around the previous landmarks
+        
+        Falls back to full-frame detection when no region is available.
+        """
+        if self.roi is None:
+            return self.update(calibration_mode)
+        
+        if not self._read_frame():
+            return False
+        
+        # Skip inference between tracked frames and extrapolate the previous landmarks
+        self.frames_since_inference += 1
+        if self.frames_since_inference < self.inference_interval:
+            if self.landmark_velocity is not None:
+                self.landmarks = self.landmarks + self.landmark_velocity
+            return self._publish_results(calibration_mode)
+        
+        # Only convert and process the previous face region
+        x0, y0, x1, y1 = self.roi
+        bgr_roi = self._work_frame[y0:y1, x0:x1]
+        rgb_roi = cv2.cvtColor(bgr_roi, cv2.COLOR_BGR2RGB, dst=self._rgb_buffer(bgr_roi.shape))
+        self.results = self.face_mesh.process(rgb_roi)
+        
+        if self.results.multi_face_landmarks:
+            landmarks = self._landmark_array(self.results.multi_face_landmarks[0])
+            self.last_confidence = self._landmark_confidence(landmarks)
+            self.landmarks = self._map_roi_landmarks(landmarks)
+            
+            # Velocity between the last two measurements, not the extrapolated frames
+            if self._measured_landmarks is not None:
+                self.landmark_velocity = (self.landmarks - self._measured_landmarks) / self.frames_since_inference
+            self._measured_landmarks = self.landmarks
+        
+        self.frames_since_inference = 0
+        return self._publish_results(calibration_mode)
+    
+    def _read_frame(self):
+        """Read and mirror the next camera frame"""
+        if self.capture_thread is None:
+            return False
+        
+        # Take the latest frame from the capture thread
+        self.frame_id, frame = self.capture_thread.read(self.frame_id, self.frame_timeout)
+        if frame is None:
+            print("Cannot read from camera")
+            return False
+        
+        # Flip image horizontally (mirror effect), alternating between two buffers
+        # so the published frame being displayed is never the one being written
+        if self._flip_buffers[0] is None or self._flip_buffers[0].shape != frame.shape:
+            self._flip_buffers = [np.empty_like(frame), np.empty_like(frame)]
+        self._flip_index ^= 1
+        self._work_frame = cv2.flip(frame, 1, dst=self._flip_buffers[self._flip_index])
+        
+        # Cache the frame geometry for the overlays
+        if frame.shape[1] != self.frame_width or frame.shape[0] != self.frame_height:
+            self.frame_height, self.frame_width = frame.shape[:2]
+            self.frame_center = (self.frame_width // 2, self.frame_height // 2)
+        
+        return True
+    
+    def _inference_frame(self):
+        """
+        Downscale the frame to the capture size if the camera delivered more
+        
+        MediaPipe resizes its input internally, so extra pixels only add cost.
+        """
+        h, w = self._work_frame.shape[:2]
+        scale = min(self.capture_width / w, self.capture_height / h)
+        if scale >= 1.0:
+            return self._work_frame
+        size = (max(1, round(w * scale)), max(1, round(h * scale)))
+        if self._small_frame is None or self._small_frame.shape[:2] != (size[1], size[0]):
+            self._small_frame = np.empty((size[1], size[0], 3), dtype=np.uint8)
+        return cv2.resize(self._work_frame, size, dst=self._small_frame, interpolation=cv2.INTER_AREA)
+    
+    def _rgb_buffer(self, shape):
+        """
+        Contiguous uint8 array of the given shape for RGB conversion
+        
+        Views one growing allocation, so face crops of any size reuse it.
+        """
+        size = shape[0] * shape[1] * shape[2]
+        if self._rgb_storage.size < size:
+            self._rgb_storage = np.empty(size, dtype=np.uint8)
+        return self._rgb_storage[:size].reshape(shape)
+    
+    def _publish_results(self, calibration_mode):
+        """Process the latest results, then publish the finished frame for display"""
+        detected = self._process_results(calibration_mode)
+        self.frame = self._work_frame
+        return detected
+    
+    def _process_results(self, calibration_mode):
+        """Update detection state and overlays from the latest results"""
         # Check if face is detected
         if self.results.multi_face_landmarks:
             self.face_detected = True
             self.last_detection_time = time.time()
+            self._update_roi(self.landmarks)
+            
+            # Compute the pose once per frame, shared by the getters and the overlay
+            self.raw_pose = self._calculate_head_pose()
             
-            # Don't draw in calibration mode
+            # Don't smooth or draw in calibration mode
             if not calibration_mode:
-                self._draw_face_mesh()
-                self._draw_control_indicators()
-                self._draw_acceleration_status()
+                self._update_head_pose()
+                if self.debug_draw:
+                    self._draw_face_mesh()
+                    self._draw_control_indicators()
+                    self._draw_acceleration_status()
         else:
+            # Lost the face, the next frame needs full detection
+            self.landmarks = None
+            self.roi = None
+            self.last_confidence = 0.0
+            self.landmark_velocity = None
+            self._measured_landmarks = None
+            self.raw_pose = (None, None)
+            
             # Check for timeout
             if time.time() - self.last_detection_time > self.detection_timeout:
                 self.face_detected = False
                 
                 # Display hint on image
-                cv2.putText(
-                    self.frame, 
-                    "No face detected", 
-                    (50, 50), 
-                    cv2.FONT_HERSHEY_SIMPLEX, 
-                    1, 
-                    (0, 0, 255), 
-                    2
-                )
+                if self.debug_draw:
+                    cv2.putText(
+                        self._work_frame, 
+                        "No face detected", 
+                        (50, 50), 
+                        cv2.FONT_HERSHEY_SIMPLEX, 
+                        1, 
+                        (0, 0, 255), 
+                        2
+                    )
         
         return self.face_detected
     
-    def get_head_angle(self):
-        """Get head left/right angle, range [-1, 1]"""
-        if not self.face_detected:
-            return 0.0
-        
-        angle, _ = self._calculate_head_pose()
+    def _landmark_array(self, face_landmarks):
+        """
+        Copy landmarks into an array
         
-        if angle is None:
+        Returns:
+            np.ndarray: (N, 3) normalized x, y, z per landmark
+        """
+        return np.array([(lm.x, lm.y, lm.z) for lm in face_landmarks.landmark], dtype=np.float32)
+    
+    def _landmark_confidence(self, landmarks):
+        """Fraction of landmarks that fall inside the processed image"""
+        xy = landmarks[:, :2]
+        inside = np.all((xy >= 0.0) & (xy <= 1.0), axis=1)
+        return np.count_nonzero(inside) / len(landmarks)
+    
+    def _map_roi_landmarks(self, landmarks):
+        """Map landmarks normalized to the region back to full-frame coordinates"""
+        h, w = self._work_frame.shape[:2]
+        x0, y0, x1, y1 = self.roi
+        scale_x = (x1 - x0) / w
+        scale_y = (y1 - y0) / h
+        
+        # z shares the x scale
+        scale = np.array([scale_x, scale_y, scale_x], dtype=np.float32)
+        offset = np.array([x0 / w, y0 / h, 0.0], dtype=np.float32)
+        return landmarks * scale + offset
+    
+    def _update_roi(self, landmarks):
+        """Derive the next tracking region from the current landmarks"""
+        h, w = self._work_frame.shape[:2]
+        min_x, min_y = landmarks[:, :2].min(axis=0).tolist()
+        max_x, max_y = landmarks[:, :2].max(axis=0).tolist()
+        
+        margin_x = (max_x - min_x) * self.roi_margin
+        margin_y = (max_y - min_y) * self.roi_margin
+        
+        x0 = max(0, int((min_x - margin_x) * w))
+        y0 = max(0, int((min_y - margin_y) * h))
+        x1 = min(w, int((max_x + margin_x) * w))
+        y1 = min(h, int((max_y + margin_y) * h))
+        
+        if x1 - x0 < self.min_roi_size or y1 - y0 < self.min_roi_size:
+            self.roi = None
+        else:
+            self.roi = (x0, y0, x1, y1)
+    
+    def set_debug_draw(self, enabled):
+        """Turn the frame overlays on or off, e.g. while the camera feed is hidden"""
+        self.debug_draw = enabled
+    
+    def get_head_angle(self):
+        """Get head left/right angle for the latest frame, range [-1, 1]"""
+        if not self.face_detected or self.raw_pose[0] is None:
             return 0.0
-        
-        # Apply calibration
-        if self.is_calibrated:
-            angle = angle - self.neutral_angle
-        
-        # Apply sensitivity
-        angle = angle * self.angle_sensitivity
-        
-        # Limit range
-        angle = max(-1.0, min(1.0, angle))
-        
-        # Smooth processing
-        angle = self.last_angle * (1 - self.smoothing_factor) + angle * self.smoothing_factor
-        self.last_angle = angle
-        
-        return angle
+        return self.current_angle
     
     def get_head_tilt(self):
-        """Get head forward/backward tilt, range [-1, 1]"""
-        if not self.face_detected:
-            return 0.0
-        
-        _, tilt = self._calculate_head_pose()
-        
-        if tilt is None:
+        """Get head forward/backward tilt for the latest frame, range [-1, 1]"""
+        if not self.face_detected or self.raw_pose[1] is None:
             return 0.0
+        return self.current_tilt
+    
+    def _update_head_pose(self):
+        """Calibrate, scale and smooth the latest raw pose into current_angle/current_tilt"""
+        angle, tilt = self.raw_pose
+        if angle is None or tilt is None:
+            return
         
         # Apply calibration
         if self.is_calibrated:
+            angle = angle - self.neutral_angle
             tilt = tilt - self.neutral_tilt
         
-        # Apply sensitivity
-        tilt = tilt * self.tilt_sensitivity
-        
-        # Limit range
-        tilt = max(-1.0, min(1.0, tilt))
+        # Apply sensitivity and limit range
+        angle = max(-1.0, min(1.0, angle * self.angle_sensitivity))
+        tilt = max(-1.0, min(1.0, tilt * self.tilt_sensitivity))
         
         # Smooth processing
-        tilt = self.last_tilt * (1 - self.smoothing_factor) + tilt * self.smoothing_factor
-        self.last_tilt = tilt
-        
-        # Save current tilt for display
-        self.current_tilt = tilt
+        self.last_angle = self.last_angle * (1 - self.smoothing_factor) + angle * self.smoothing_factor
+        self.last_tilt = self.last_tilt * (1 - self.smoothing_factor) + tilt * self.smoothing_factor
         
-        return tilt
+        # Save for the getters and the overlay
+        self.current_angle = self.last_angle
+        self.current_tilt = self.last_tilt
     
     def _calculate_head_pose(self):
         """Calculate head pose"""
-        if not self.results.multi_face_landmarks:
+        if self.landmarks is None:
             return None, None
         
-        face_landmarks = self.results.multi_face_landmarks[0]
-        
-        # Get key points
-        nose_tip = face_landmarks.landmark[4]
-        left_eye = face_landmarks.landmark[33]
-        right_eye = face_landmarks.landmark[263]
-        mouth_left = face_landmarks.landmark[61]
-        mouth_right = face_landmarks.landmark[291]
-        
-        # Calculate head left/right angle (based on eye horizontal line)
-        dx_eyes = right_eye.x - left_eye.x
-        dy_eyes = right_eye.y - left_eye.y
-        angle = math.atan2(dy_eyes, dx_eyes)
-        
-        # Calculate head forward/backward tilt (based on vertical distance between nose tip and mouth center)
-        mouth_center_y = (mouth_left.y + mouth_right.y) / 2
-        tilt = nose_tip.z  # Use nose tip z-coordinate to represent forward/backward tilt
-        
-        return angle, tilt
+        return _head_pose(self.landmarks)
     
     def _draw_face_mesh(self):
         """Draw face mesh"""
-        if not self.results.multi_face_landmarks:
+        if self.landmarks is None:
             return
         
-        h, w, c = self.frame.shape
-        face_landmarks = self.results.multi_face_landmarks[0]
+        h, w, c = self._work_frame.shape
         
-        # Draw key points
-        for idx, landmark in enumerate(face_landmarks.landmark):
-            x, y = int(landmark.x * w), int(landmark.y * h)
-            
-            # Only draw some key points to avoid overcrowding
-            if idx % 5 == 0:
-                cv2.circle(self.frame, (x, y), 1, (0, 255, 0), -1)
-        
-        # Draw eyes
-        left_eye = [(33, 160), (160, 158), (158, 133), (133, 153), (153, 144), (144, 33)]
-        right_eye = [(263, 387), (387, 385), (385, 362), (362, 382), (382, 381), (381, 263)]
-        
-        for connections in [left_eye, right_eye]:
-            for start_idx, end_idx in connections:
-                start_point = face_landmarks.landmark[start_idx]
-                end_point = face_landmarks.landmark[end_idx]
-                
-                start_x, start_y = int(start_point.x * w), int(start_point.y * h)
-                end_x, end_y = int(end_point.x * w), int(end_point.y * h)
-                
-                cv2.line(self.frame, (start_x, start_y), (end_x, end_y), (0, 255, 255), 1)
+        # Convert all landmarks to pixel coordinates at once
+        points = (self.landmarks[:, :2] * (w, h)).astype(np.int32)
         
-        # Draw mouth outline
-        mouth_outline = [(61, 146), (146, 91), (91, 181), (181, 84), (84, 17), 
-                         (17, 314), (314, 405), (405, 321), (321, 375), (375, 291)]
+        # Draw key points, only some of them to avoid overcrowding
+        for x, y in points[::5].tolist():
+            cv2.circle(self._work_frame, (x, y), 1, (0, 255, 0), -1)
         
-        for start_idx, end_idx in mouth_outline:
-            start_point = face_landmarks.landmark[start_idx]
-            end_point = face_landmarks.landmark[end_idx]
-            
-            start_x, start_y = int(start_point.x * w), int(start_point.y * h)
-            end_x, end_y = int(end_point.x * w), int(end_point.y * h)
-            
-            cv2.line(self.frame, (start_x, start_y), (end_x, end_y), (0, 255, 255), 1)
+        # Draw eyes (closed outlines)
+        cv2.polylines(self._work_frame, [points[_LEFT_EYE], points[_RIGHT_EYE]], True, (0, 255, 255), 1)
+        
+        # Draw mouth outline
+        cv2.polylines(self._work_frame, [points[_MOUTH_OUTLINE]], False, (0, 255, 255), 1)
     
     def _draw_control_indicators(self):
         """Draw control indicators"""
         if not self.results.multi_face_landmarks:
             return
         
-        h, w, c = self.frame.shape
+        h, w = self.frame_height, self.frame_width
+        cx, cy = self.frame_center
         
         # Get head angle and tilt
         angle = self.get_head_angle()
         tilt = self.get_head_tilt()
         
         # Draw left/right turning indicator
-        cv2.rectangle(self.frame, (w//2 - 100, h - 60), (w//2 + 100, h - 40), (255, 255, 255), 1)
-        indicator_x = int(w//2 + angle * 100)
-        cv2.rectangle(self.frame, (indicator_x - 5, h - 60), (indicator_x + 5, h - 40), (0, 255, 0), -1)
-        cv2.putText(self.frame, "Left/Right", (w//2 - 40, h - 70), cv2.FONT_HERSHEY_SIMPLEX, 0.5, (255, 255, 255), 1)
+        cv2.rectangle(self._work_frame, (cx - 100, h - 60), (cx + 100, h - 40), (255, 255, 255), 1)
+        indicator_x = int(cx + angle * 100)
+        cv2.rectangle(self._work_frame, (indicator_x - 5, h - 60), (indicator_x + 5, h - 40), (0, 255, 0), -1)
+        cv2.putText(self._work_frame, "Left/Right", (cx - 40, h - 70), cv2.FONT_HERSHEY_SIMPLEX, 0.5, (255, 255, 255), 1)
         
         # Draw forward/backward tilt indicator
-        cv2.rectangle(self.frame, (w - 60, h//2 - 100), (w - 40, h//2 + 100), (255, 255, 255), 1)
-        indicator_y = int(h//2 + tilt * 100)
-        cv2.rectangle(self.frame, (w - 60, indicator_y - 5), (w - 40, indicator_y + 5), (0, 255, 0), -1)
-        cv2.putText(self.frame, "Closer=Brake, Away=Accel", (w - 200, h//2 - 110), cv2.FONT_HERSHEY_SIMPLEX, 0.5, (255, 255, 255), 1)
+        cv2.rectangle(self._work_frame, (w - 60, cy - 100), (w - 40, cy + 100), (255, 255, 255), 1)
+        indicator_y = int(cy + tilt * 100)
+        cv2.rectangle(self._work_frame, (w - 60, indicator_y - 5), (w - 40, indicator_y + 5), (0, 255, 0), -1)
+        cv2.putText(self._work_frame, "Closer=Brake, Away=Accel", (w - 200, cy - 110), cv2.FONT_HERSHEY_SIMPLEX, 0.5, (255, 255, 255), 1)
         
         # Draw calibration status
         if self.is_calibrated:
@@ -325,11 +695,11 @@ class HeadTracker:
             status_text = "Not Calibrated"
             color = (0, 0, 255)
         
-        cv2.putText(self.frame, status_text, (10, 30), cv2.FONT_HERSHEY_SIMPLEX, 0.7, color, 2)
+        cv2.putText(self._work_frame, status_text, (10, 30), cv2.FONT_HERSHEY_SIMPLEX, 0.7, color, 2)
         
         # Draw sensitivity information
         cv2.putText(
-            self.frame, 
+            self._work_frame, 
             f"Sensitivity: Angle={self.angle_sensitivity:.1f}, Tilt={self.tilt_sensitivity:.1f}", 
             (10, h - 10), 
             cv2.FONT_HERSHEY_SIMPLEX, 
@@ -340,7 +710,7 @@ class HeadTracker:
         
         # Draw current angle and tilt
         cv2.putText(
-            self.frame, 
+            self._work_frame, 
             f"Angle: {angle:.2f}, Tilt: {tilt:.2f}", 
             (10, 60), 
             cv2.FONT_HERSHEY_SIMPLEX, 
@@ -354,18 +724,15 @@ class HeadTracker:
         if not hasattr(self, 'current_tilt'):
             return
         
-        h, w, c = self.frame.shape
+        cx = self.frame_center[0]
         tilt = self.current_tilt
         
-        # Create status area
-        status_area = np.zeros((80, 200, 3), dtype=np.uint8)
-        
         # Display different status based on tilt
         if tilt < -0.1:  # Accelerating
             cv2.putText(
-                self.frame, 
+                self._work_frame, 
                 "Accelerating", 
-                (w//2 - 60, 40), 
+                (cx - 60, 40), 
                 cv2.FONT_HERSHEY_SIMPLEX, 
                 0.8, 
                 (0, 255, 0), 
@@ -373,18 +740,18 @@ class HeadTracker:
             )
             # Draw acceleration arrow
             cv2.arrowedLine(
-                self.frame,
-                (w//2, 60),
-                (w//2, 100),
+                self._work_frame,
+                (cx, 60),
+                (cx, 100),
                 (0, 255, 0),
                 2,
                 tipLength=0.3
             )
         elif tilt > 0.1:  # Braking
             cv2.putText(
-                self.frame, 
+                self._work_frame, 
                 "Braking", 
-                (w//2 - 40, 40), 
+                (cx - 40, 40), 
                 cv2.FONT_HERSHEY_SIMPLEX, 
                 0.8, 
                 (0, 0, 255), 
@@ -392,18 +759,18 @@ class HeadTracker:
             )
             # Draw braking arrow
             cv2.arrowedLine(
-                self.frame,
-                (w//2, 100),
-                (w//2, 60),
+                self._work_frame,
+                (cx, 100),
+                (cx, 60),
                 (0, 0, 255),
                 2,
                 tipLength=0.3
             )
         else:  # Constant speed
             cv2.putText(
-                self.frame, 
+                self._work_frame, 
                 "Steady", 
-                (w//2 - 30, 40), 
+                (cx - 30, 40), 
                 cv2.FONT_HERSHEY_SIMPLEX, 
                 0.8, 
                 (255, 255, 0), 
@@ -411,9 +778,9 @@ class HeadTracker:
             )
             # Draw steady line
             cv2.line(
-                self.frame,
-                (w//2 - 30, 80),
-                (w//2 + 30, 80),
+                self._work_frame,
+                (cx - 30, 80),
+                (cx + 30, 80),
                 (255, 255, 0),
                 2
             )
@@ -428,28 +795,59 @@ class HeadTracker:
         return self.processed_frame
     
     def get_frame_surface(self, width=None, height=None):
-        """Get current frame as pygame surface"""
-        if self.frame is None:
-            # Create a black image
-            img = np.zeros((height or 480, width or 640, 3), dtype=np.uint8)
-            cv2.putText(img, "Camera not available", (50, 50), cv2.FONT_HERSHEY_SIMPLEX, 1, (255, 255, 255), 2)
-        else:
-            img = self.frame.copy()
+        """
+        Get current frame as pygame surface
         
-        # Resize
-        if width is not None and height is not None:
-            img = cv2.resize(img, (width, height))
+        The same surface is returned and overwritten on every call while the
+        size stays the same.
+        """
+        # Default to the frame size, or 640x480 when there is no frame yet
+        if width is None or height is None:
+            frame = self.frame
+            height, width = frame.shape[:2] if frame is not None else (480, 640)
         
-        # Convert to pygame surface - fix rotation issue
-        img = cv2.cvtColor(img, cv2.COLOR_BGR2RGB)
+        # (Re)allocate the surface only when the size changes
+        if self.frame_surface is None or self.frame_surface.get_size() != (width, height):
+            self.frame_surface = pygame.Surface((width, height))
+        
+        return self.blit_frame_into(self.frame_surface)
+    
+    def blit_frame_into(self, surface):
+        """
+        Draw current frame into an existing pygame surface
+        
+        Resizing and color conversion write into preallocated buffers, so
+        no arrays or surfaces are allocated per frame.
+        
+        Args:
+            surface (pygame.Surface): Target surface, its size sets the output size
+        
+        Returns:
+            pygame.Surface: The target surface
+        """
+        width, height = surface.get_size()
+        
+        # (Re)allocate buffers only when the target size changes
+        if self._display_bgr is None or self._display_bgr.shape[:2] != (height, width):
+            self._display_bgr = np.empty((height, width, 3), dtype=np.uint8)
+            self._display_rgb = np.empty((height, width, 3), dtype=np.uint8)
+        
+        frame = self.frame
+        if frame is None:
+            self._display_bgr.fill(0)
+            cv2.putText(self._display_bgr, "Camera not available", (10, 30), cv2.FONT_HERSHEY_SIMPLEX, 0.6, (255, 255, 255), 1)
+        else:
+            cv2.resize(frame, (width, height), dst=self._display_bgr, interpolation=cv2.INTER_NEAREST)
         
-        # Create Surface directly, without rotation
-        surface = pygame.surfarray.make_surface(img.swapaxes(0, 1))
+        cv2.cvtColor(self._display_bgr, cv2.COLOR_BGR2RGB, dst=self._display_rgb)
+        pygame.surfarray.blit_array(surface, self._display_rgb.swapaxes(0, 1))
         
         return surface
     
     def __del__(self):
         """Release resources"""
+        if self.capture_thread is not None:
+            self.capture_thread.stop()
         if self.cap is not None:
             self.cap.release()
         self.face_mesh.close()
@@ -0,0 +1,22 @@
+"""
+Optional Numba support shared by the game and head tracking kernels
+"""
+
+try:
+    from numba import njit
+except ImportError:
+    # Numba is optional, without it the kernels run as plain Python
+    def njit(*args, **kwargs):
+        if len(args) == 1 and callable(args[0]):
+            return args[0]
+        return lambda func: func
+
+def warm_up(kernel, *args):
+    """
+    Compile a kernel at import instead of on its first real call
+    
+    Args:
+        kernel: Function decorated with njit
+        *args: Example arguments with the types the caller passes
+    """
+    kernel(*args)